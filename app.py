@@ -16,16 +16,24 @@ Key Features:
 
 import os
 import secrets
+import threading
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Optional
 
+import httpx
 import jwt
-from fastapi import FastAPI, HTTPException, Depends, Header
-from fastapi.responses import JSONResponse, HTMLResponse
+import orjson
+from fastapi import FastAPI, HTTPException, Depends, Header, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from deepgram import DeepgramClient
+from pydantic import BaseModel, model_validator
+from pydantic_core import PydanticCustomError
+from deepgram import AsyncDeepgramClient, DeepgramClientEnvironment
 from dotenv import load_dotenv
 import toml
 
@@ -35,6 +43,9 @@ load_dotenv(override=False)
 CONFIG = {
     "port": int(os.environ.get("PORT", 8081)),
     "host": os.environ.get("HOST", "0.0.0.0"),
+    "workers": int(os.environ.get("WORKERS", 1)),
+    # Comma-separated origins allowed to call the API cross-origin
+    "allowed_origins": [o.strip() for o in os.environ.get("ALLOWED_ORIGINS", "*").split(",") if o.strip()],
 }
 
 # ============================================================================
@@ -44,54 +55,78 @@ CONFIG = {
 SESSION_SECRET = os.environ.get("SESSION_SECRET") or secrets.token_hex(32)
 JWT_EXPIRY = 3600  # 1 hour
 
+# Reusable PyJWT instance with the required claims preset, plus the secret
+# pre-encoded to bytes, so each request skips option and key setup
+_jwt = jwt.PyJWT(options={"require": ["exp"]})
+_SESSION_KEY = SESSION_SECRET.encode()
+
+# LRU of recently verified tokens -> exp claim. A hit skips the HMAC check
+# until the token's own expiry; tokens are signed, so an entry can only exist
+# for a token whose signature was already verified.
+_VERIFIED_TOKENS_MAX = 10000
+_verified_tokens = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
+# Auth error bodies are static, so build them once
+_MISSING_TOKEN_ERROR = {
+    "error": {
+        "type": "AuthenticationError",
+        "code": "MISSING_TOKEN",
+        "message": "Authorization header with Bearer token is required",
+    }
+}
+_EXPIRED_TOKEN_ERROR = {
+    "error": {
+        "type": "AuthenticationError",
+        "code": "INVALID_TOKEN",
+        "message": "Session expired, please refresh the page",
+    }
+}
+_INVALID_TOKEN_ERROR = {
+    "error": {
+        "type": "AuthenticationError",
+        "code": "INVALID_TOKEN",
+        "message": "Invalid session token",
+    }
+}
 
-# Read frontend/dist/index.html for serving
-_index_html_template = None
+
+# Read frontend/dist/index.html for serving, kept as bytes so each response
+# is sent as-is without re-encoding the page
+_index_html = None
 try:
-    with open(os.path.join(os.path.dirname(__file__), "frontend", "dist", "index.html")) as f:
-        _index_html_template = f.read()
+    with open(os.path.join(os.path.dirname(__file__), "frontend", "dist", "index.html"), "rb") as f:
+        _index_html = f.read()
 except FileNotFoundError:
     pass  # No built frontend (dev mode)
 
 
 def require_session(authorization: str = Header(None)):
     """FastAPI dependency for JWT session validation."""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401,
-            detail={
-                "error": {
-                    "type": "AuthenticationError",
-                    "code": "MISSING_TOKEN",
-                    "message": "Authorization header with Bearer token is required",
-                }
-            }
-        )
-    token = authorization[7:]
+    token = authorization.removeprefix("Bearer ") if authorization else None
+    if token is None or len(token) == len(authorization):
+        raise HTTPException(status_code=401, detail=_MISSING_TOKEN_ERROR)
+    # A JWT is always three dot-separated segments; reject anything else
+    # without going through PyJWT
+    if token.count(".") != 2:
+        raise HTTPException(status_code=401, detail=_INVALID_TOKEN_ERROR)
+    with _verified_tokens_lock:
+        exp = _verified_tokens.get(token)
+        if exp is not None:
+            if exp > time.time():
+                _verified_tokens.move_to_end(token)
+                return
+            del _verified_tokens[token]
     try:
-        jwt.decode(token, SESSION_SECRET, algorithms=["HS256"])
+        payload = _jwt.decode(token, _SESSION_KEY, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=401,
-            detail={
-                "error": {
-                    "type": "AuthenticationError",
-                    "code": "INVALID_TOKEN",
-                    "message": "Session expired, please refresh the page",
-                }
-            }
-        )
+        raise HTTPException(status_code=401, detail=_EXPIRED_TOKEN_ERROR)
     except jwt.InvalidTokenError:
-        raise HTTPException(
-            status_code=401,
-            detail={
-                "error": {
-                    "type": "AuthenticationError",
-                    "code": "INVALID_TOKEN",
-                    "message": "Invalid session token",
-                }
-            }
-        )
+        raise HTTPException(status_code=401, detail=_INVALID_TOKEN_ERROR)
+    with _verified_tokens_lock:
+        _verified_tokens[token] = payload["exp"]
+        if len(_verified_tokens) > _VERIFIED_TOKENS_MAX:
+            _verified_tokens.popitem(last=False)
 
 
 # ============================================================================
@@ -120,19 +155,48 @@ api_key = load_api_key()
 # SETUP
 # ============================================================================
 
-deepgram = DeepgramClient(api_key=api_key)
+async def warm_deepgram_connection(http_client: httpx.AsyncClient):
+    """Opens a pooled connection to the Deepgram API before the first request"""
+    # Any response will do: the point is to pay for DNS + TLS at startup. The
+    # connection stays in the pool for the pool's keepalive_expiry (60s), so
+    # the first analyze call reuses it only if it arrives within that window.
+    try:
+        await http_client.head(DeepgramClientEnvironment.PRODUCTION.base, timeout=5)
+    except httpx.HTTPError as e:
+        print(f"Deepgram connection warmup failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Creates one Deepgram client per process and closes its connection pool on shutdown"""
+    # A single pooled HTTP client reuses connections to api.deepgram.com, so
+    # requests within keepalive_expiry of the last one skip DNS + TLS. httpx
+    # defaults to dropping idle connections after 5s; 60s keeps them across
+    # normal gaps between user actions while staying under the server's own
+    # idle timeout.
+    http_client = httpx.AsyncClient(
+        timeout=60,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=100, keepalive_expiry=60),
+    )
+    app.state.deepgram = AsyncDeepgramClient(api_key=api_key, httpx_client=http_client)
+    await warm_deepgram_connection(http_client)
+    yield
+    await http_client.aclose()
 
 app = FastAPI(
     title="Deepgram Text Intelligence API",
     description="Text analysis powered by Deepgram",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CONFIG["allowed_origins"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache preflight responses for 24h
 )
 
 # ============================================================================
@@ -143,26 +207,88 @@ class TextInput(BaseModel):
     text: Optional[str] = None
     url: Optional[str] = None
 
+    @model_validator(mode="after")
+    def check_text_or_url(self):
+        """Validates that the body has exactly one of text or url"""
+        # The error type doubles as the contract error code
+        if not self.text and not self.url:
+            raise PydanticCustomError("INVALID_TEXT", "Request must contain either 'text' or 'url' field")
+
+        if self.text and self.url:
+            raise PydanticCustomError("INVALID_TEXT", "Request must contain either 'text' or 'url', not both")
+
+        if self.url:
+            if not self.url.startswith(('http://', 'https://')):
+                raise PydanticCustomError("INVALID_URL", "Invalid URL format")
+        elif not self.text.strip():
+            raise PydanticCustomError("INVALID_TEXT", "Text content cannot be empty")
+
+        return self
+
+    def to_request(self):
+        """Returns the request body for the Deepgram SDK"""
+        return {"url": self.url} if self.url else {"text": self.text}
+
+@lru_cache(maxsize=32)
+def validation_error_body(error_code: str, message: str):
+    """Serializes a validation error once; the messages passed in are static"""
+    return orjson.dumps({
+        "error": {
+            "type": "validation_error",
+            "code": error_code,
+            "message": message,
+            "details": {}
+        }
+    })
+
+def validation_error_response(error_code: str, message: str):
+    """Returns a 400 response with a pre-serialized validation error body"""
+    return Response(
+        content=validation_error_body(error_code, message),
+        status_code=400,
+        media_type="application/json"
+    )
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """Returns request validation errors in the contract's error format"""
+    error = exc.errors()[0]
+    if error["type"] in ("INVALID_TEXT", "INVALID_URL"):
+        # Raised by TextInput with a fixed message, so the body can be reused
+        return validation_error_response(error["type"], error["msg"])
+
+    return ORJSONResponse(
+        status_code=400,
+        content={
+            "error": {
+                "type": "validation_error",
+                "code": "INVALID_TEXT",
+                "message": error["msg"],
+                "details": {}
+            }
+        }
+    )
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def validate_text_input(body: TextInput):
-    """Validates that JSON body has exactly one of text or url"""
-    if not body.text and not body.url:
-        return None, "Request must contain either 'text' or 'url' field"
-
-    if body.text and body.url:
-        return None, "Request must contain either 'text' or 'url', not both"
-
-    if body.url:
-        if not body.url.startswith(('http://', 'https://')):
-            return None, "Invalid URL format"
-        return {"url": body.url}, None
-    else:
-        if not body.text.strip():
-            return None, "Text content cannot be empty"
-        return {"text": body.text}, None
+# Every recognized (summarize, topics, sentiment, intents) combination mapped
+# to its SDK options, so each request is a single dict lookup
+_SUMMARIZE_VALUES = {None: {}, "true": {"summarize": True}, "v2": {"summarize": "v2"}}
+_FLAG_VALUES = (None, "true")
+_OPTIONS_TABLE = {
+    (summarize, topics, sentiment, intents): {
+        **summarize_options,
+        **({"topics": True} if topics else {}),
+        **({"sentiment": True} if sentiment else {}),
+        **({"intents": True} if intents else {}),
+    }
+    for summarize, summarize_options in _SUMMARIZE_VALUES.items()
+    for topics in _FLAG_VALUES
+    for sentiment in _FLAG_VALUES
+    for intents in _FLAG_VALUES
+}
 
 def build_deepgram_options(
     language: str = "en",
@@ -172,23 +298,60 @@ def build_deepgram_options(
     intents: Optional[str] = None
 ):
     """Converts query parameters to SDK keyword arguments"""
-    options = {"language": language}
+    options = _OPTIONS_TABLE.get((summarize, topics, sentiment, intents))
+    if options is None:
+        if summarize == "v1":
+            return None, "Summarization v1 is no longer supported. Please use v2 or true."
+        # Any other unrecognized value is ignored, same as leaving the parameter out
+        options = _OPTIONS_TABLE[(
+            summarize if summarize in _SUMMARIZE_VALUES else None,
+            topics if topics == "true" else None,
+            sentiment if sentiment == "true" else None,
+            intents if intents == "true" else None,
+        )]
+
+    return {"language": language, **options}, None
+
+# Response type -> function that serializes its results to JSON bytes
+_results_serializers = {}
+
+def serialize_results(response_data):
+    """Serializes the results of a Deepgram response to JSON bytes"""
+    # The SDK returns the same type on every call, so pick the conversion once
+    serializer = _results_serializers.get(type(response_data))
+    if serializer is None:
+        if hasattr(response_data, 'to_dict'):
+            if hasattr(response_data.results, 'to_dict'):
+                serializer = lambda r: orjson.dumps(r.results.to_dict())
+            else:
+                serializer = lambda r: b'{}'
+        elif hasattr(response_data, 'model_dump'):
+            serializer = lambda r: orjson.dumps(r.results.model_dump())
+        elif hasattr(response_data, 'results'):
+            serializer = lambda r: orjson.dumps(dict(r.results))
+        else:
+            serializer = lambda r: b'{}'
+        _results_serializers[type(response_data)] = serializer
+    return serializer(response_data)
 
-    if summarize == "true":
-        options["summarize"] = True
-    elif summarize == "v2":
-        options["summarize"] = "v2"
-    elif summarize == "v1":
-        return None, "Summarization v1 is no longer supported. Please use v2 or true."
+def load_metadata():
+    """Reads the [meta] section of deepgram.toml and pre-serializes it to JSON bytes"""
+    try:
+        with open(os.path.join(os.path.dirname(__file__), "deepgram.toml")) as f:
+            config = toml.load(f)
+    except FileNotFoundError:
+        return None, "deepgram.toml file not found"
+    except Exception as e:
+        print(f"Error reading metadata: {e}")
+        return None, f"Failed to read metadata from deepgram.toml: {str(e)}"
 
-    if topics == "true":
-        options["topics"] = True
-    if sentiment == "true":
-        options["sentiment"] = True
-    if intents == "true":
-        options["intents"] = True
+    if "meta" not in config:
+        return None, "Missing [meta] section in deepgram.toml"
 
-    return options, None
+    return orjson.dumps(config["meta"]), None
+
+# deepgram.toml is static for the life of the process, so parse it once
+_metadata_json, _metadata_error = load_metadata()
 
 # ============================================================================
 # SESSION ROUTES - Auth endpoints (unprotected)
@@ -197,20 +360,21 @@ def build_deepgram_options(
 @app.get("/", response_class=HTMLResponse)
 async def serve_index():
     """Serve index.html."""
-    if not _index_html_template:
+    if not _index_html:
         raise HTTPException(status_code=404, detail="Frontend not built. Run make build first.")
-    return HTMLResponse(content=_index_html_template)
+    return HTMLResponse(content=_index_html)
 
 
 @app.get("/api/session")
 async def get_session():
     """Issues a JWT session token."""
+    now = int(time.time())
     token = jwt.encode(
-        {"iat": int(time.time()), "exp": int(time.time()) + JWT_EXPIRY},
-        SESSION_SECRET,
+        {"iat": now, "exp": now + JWT_EXPIRY},
+        _SESSION_KEY,
         algorithm="HS256",
     )
-    return JSONResponse(content={"token": token})
+    return ORJSONResponse(content={"token": token})
 
 
 # ============================================================================
@@ -219,6 +383,7 @@ async def get_session():
 
 @app.post("/api/text-intelligence")
 async def analyze(
+    request: Request,
     body: TextInput,
     language: str = "en",
     summarize: Optional[str] = None,
@@ -235,76 +400,44 @@ async def analyze(
     Query parameters: summarize, topics, sentiment, intents, language
     """
     try:
-        # Validate text input
-        request_dict, error_msg = validate_text_input(body)
-        if error_msg:
-            error_code = "INVALID_TEXT" if "text" in error_msg.lower() else "INVALID_URL"
-            response = JSONResponse(
-                status_code=400,
-                content={
-                    "error": {
-                        "type": "validation_error",
-                        "code": error_code,
-                        "message": error_msg,
-                        "details": {}
-                    }
-                }
-            )
-            return response
-
         # Build Deepgram options
         options, error_msg = build_deepgram_options(
             language, summarize, topics, sentiment, intents
         )
         if error_msg:
-            response = JSONResponse(
-                status_code=400,
-                content={
-                    "error": {
-                        "type": "validation_error",
-                        "code": "INVALID_TEXT",
-                        "message": error_msg,
-                        "details": {}
-                    }
-                }
-            )
-            return response
+            return validation_error_response("INVALID_TEXT", error_msg)
 
-        # Call Deepgram API
-        response_data = deepgram.read.v1.text.analyze(
-            request=request_dict,
+        # Call Deepgram API (async client, so the event loop is not blocked)
+        response_data = await request.app.state.deepgram.read.v1.text.analyze(
+            request=body.to_request(),
             **options
         )
 
-        # Convert Pydantic model to dict
-        if hasattr(response_data, 'to_dict'):
-            result = {"results": response_data.results.to_dict() if hasattr(response_data.results, 'to_dict') else {}}
-        elif hasattr(response_data, 'model_dump'):
-            result_data = response_data.model_dump()
-            result = {"results": result_data.get('results', {})}
-        else:
-            result = {"results": dict(response_data.results) if hasattr(response_data, 'results') else {}}
-
-        return JSONResponse(status_code=200, content=result)
+        # Serialize only the results (not the whole response) straight to JSON
+        # bytes, and wrap them without re-encoding
+        results = serialize_results(response_data)
+        return Response(content=b'{"results":' + results + b'}', media_type="application/json")
 
     except Exception as e:
         print(f"Text Intelligence Error: {e}")
 
-        error_code = "INVALID_TEXT"
         error_message = str(e)
-        status_code = 500
-
-        if "text" in str(e).lower():
+        lowered = error_message.lower()
+
+        # "too long" goes first: those errors also mention "text"
+        for phrase, error_code in (
+            ("too long", "TEXT_TOO_LONG"),
+            ("text", "INVALID_TEXT"),
+            ("url", "INVALID_URL"),
+        ):
+            if phrase in lowered:
+                status_code = 400
+                break
+        else:
             error_code = "INVALID_TEXT"
-            status_code = 400
-        elif "url" in str(e).lower():
-            error_code = "INVALID_URL"
-            status_code = 400
-        elif "too long" in str(e).lower():
-            error_code = "TEXT_TOO_LONG"
-            status_code = 400
-
-        return JSONResponse(
+            status_code = 500
+
+        return ORJSONResponse(
             status_code=status_code,
             content={
                 "error": {
@@ -328,39 +461,16 @@ async def get_metadata():
 
     Returns metadata about this starter application from deepgram.toml
     """
-    try:
-        with open('deepgram.toml', 'r') as f:
-            config = toml.load(f)
-
-        if 'meta' not in config:
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    'error': 'INTERNAL_SERVER_ERROR',
-                    'message': 'Missing [meta] section in deepgram.toml'
-                }
-            )
-
-        return JSONResponse(content=config['meta'], status_code=200)
-
-    except FileNotFoundError:
+    if _metadata_error:
         raise HTTPException(
             status_code=500,
             detail={
                 'error': 'INTERNAL_SERVER_ERROR',
-                'message': 'deepgram.toml file not found'
+                'message': _metadata_error
             }
         )
 
-    except Exception as e:
-        print(f"Error reading metadata: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                'error': 'INTERNAL_SERVER_ERROR',
-                'message': f'Failed to read metadata from deepgram.toml: {str(e)}'
-            }
-        )
+    return Response(content=_metadata_json, media_type="application/json")
 
 # ============================================================================
 # FRONTEND SERVING
@@ -384,4 +494,14 @@ if __name__ == "__main__":
     print(f"  GET  /docs (OpenAPI documentation)")
     print("=" * 70 + "\n")
 
-    uvicorn.run(app, host=CONFIG["host"], port=CONFIG["port"])
+    # Workers are separate processes that re-import this module; pass the
+    # session secret through the environment so they all verify the same JWTs
+    os.environ["SESSION_SECRET"] = SESSION_SECRET
+
+    uvicorn.run(
+        "app:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=CONFIG["host"],
+        port=CONFIG["port"],
+        workers=CONFIG["workers"],
+    )